@@ -5,11 +5,23 @@ Frictionless simulation: no fees, no slippage, no funding costs.
 Data: ETH 1h CSV (default: eth_1h.csv)
 """
 
-import csv
+import math
+import os
+import re
 from datetime import datetime, timezone
 from typing import List, Dict, Tuple, Optional
 
-from v3_math import lp_value, amounts_from_L
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+try:
+    # optional: multi-threaded CSV reader for large (e.g. 1m, multi-year) files
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+from v3_math import lp_value, amounts_from_L, amounts_from_sqrtP_fast
 from init_position import calc_usdt_for_eth_in_pool
 
 import config as cfg
@@ -18,19 +30,26 @@ import config as cfg
 # -----------------------------
 # Helpers: time parsing
 # -----------------------------
+_NUMERIC_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
 def _parse_ts_any(ts_raw: str) -> datetime:
     s = (ts_raw or "").strip()
 
     # 1) ISO (with or without timezone)
-    try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return dt
-    except Exception:
-        pass
+    # Plain numbers skip straight to the epoch branch: no raise/except per row,
+    # and fromisoformat (py>=3.11) would misread some epoch-ms digit strings
+    # as compact ISO dates.
+    if not _NUMERIC_RE.match(s):
+        try:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            else:
+                dt = dt.astimezone(timezone.utc)
+            return dt
+        except Exception:
+            pass
 
     # 2) epoch seconds/ms/us/ns
     x = float(s)
@@ -46,6 +65,64 @@ def _parse_ts_any(ts_raw: str) -> datetime:
     return datetime.fromtimestamp(sec, tz=timezone.utc)
 
 
+def _to_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+# datetime64[ns] range (int64 ns, NaT excluded), rounded inward to whole us
+_DT64_NS_MAX = np.datetime64(np.iinfo(np.int64).max // 1000, "us")
+_DT64_NS_MIN = np.datetime64(-(np.iinfo(np.int64).max // 1000), "us")
+
+
+def _to_dt64(ts: datetime) -> np.datetime64:
+    """
+    datetime -> naive-UTC datetime64[ns] (the loader's timestamp dtype).
+
+    Converted at [us] (covers every datetime) and clamped to the [ns] range
+    (~1678..2262) first, so far-off bounds like datetime(9999, 12, 31) stay
+    open-ended instead of wrapping around.
+    """
+    us = np.datetime64(_to_utc(ts).replace(tzinfo=None), "us")
+    return min(max(us, _DT64_NS_MIN), _DT64_NS_MAX).astype("datetime64[ns]")
+
+
+def _ts_column_to_dt64(col: pd.Series) -> np.ndarray:
+    """
+    Vectorized _parse_ts_any over a whole column.
+
+    Numeric columns are epoch seconds/ms/us/ns (picked per value by magnitude),
+    datetime columns are taken as-is, anything else is ISO. Returns naive-UTC
+    datetime64[ns].
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        # already parsed (pyarrow-inferred timestamps); naive means UTC
+        dt = pd.DatetimeIndex(col)
+        if dt.tz is not None:
+            dt = dt.tz_convert("UTC").tz_localize(None)
+        return dt.to_numpy().astype("datetime64[ns]")
+
+    if pd.api.types.is_numeric_dtype(col):
+        x = col.to_numpy()
+        ax = np.abs(x)
+        # epoch seconds/ms/us/ns -> ns
+        scale = np.select([ax >= 1e18, ax >= 1e15, ax >= 1e12], [1, 1_000, 1_000_000], 1_000_000_000)
+        if pd.api.types.is_integer_dtype(col):
+            ns = x.astype(np.int64) * scale
+        else:
+            ns = np.round(x * scale).astype(np.int64)
+        return ns.view("datetime64[ns]")
+
+    s = col.astype(str).str.strip()
+    try:
+        dt = pd.to_datetime(s, utc=True, format="ISO8601")
+    except (ValueError, TypeError):
+        # mixed / odd formats: fall back to the per-row parser
+        dt = pd.to_datetime([_parse_ts_any(v) for v in s], utc=True)
+    return pd.DatetimeIndex(dt).tz_localize(None).to_numpy().astype("datetime64[ns]")
+
+
 def _pick_col(fieldnames: List[str], candidates: List[str]) -> str:
     norm = {fn.strip().lower(): fn for fn in fieldnames if fn is not None}
     for c in candidates:
@@ -54,7 +131,7 @@ def _pick_col(fieldnames: List[str], candidates: List[str]) -> str:
     raise ValueError(f"Cannot find columns {candidates} in {fieldnames}")
 
 
-def load_eth_1h_csv(filename: str) -> List[Tuple[datetime, float]]:
+def load_eth_1h_csv(filename: str) -> Tuple[np.ndarray, np.ndarray]:
     """
     Load ETH 1h close data from CSV.
 
@@ -64,43 +141,73 @@ def load_eth_1h_csv(filename: str) -> List[Tuple[datetime, float]]:
 
     Supports close columns:
       - close (tolerates trailing spaces)
+
+    Parsed with pyarrow.csv (multi-threaded) when pyarrow is installed,
+    otherwise with pandas' C parser; both go through the same column
+    conversion below.
+
+    Returns:
+        (timestamps, prices): datetime64[ns] (naive UTC) and float64 arrays,
+        sorted by timestamp.
     """
-    rows: List[Tuple[datetime, float]] = []
-    with open(filename, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            raise ValueError("CSV has no headers")
-
-        ts_col = _pick_col(
-            reader.fieldnames,
-            ["timestamp", "open_time", "open_time_ms", "time", "date"]
+    try:
+        fieldnames = list(pd.read_csv(filename, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        fieldnames = []
+    if not fieldnames:
+        raise ValueError("CSV has no headers")
+
+    ts_col = _pick_col(
+        fieldnames,
+        ["timestamp", "open_time", "open_time_ms", "time", "date"]
+    )
+    close_col = _pick_col(fieldnames, ["close", "close "])
+
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            filename,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(include_columns=[ts_col, close_col]),
         )
-        close_col = _pick_col(reader.fieldnames, ["close", "close "])
+        df = table.to_pandas()
+    else:
+        df = pd.read_csv(filename, usecols=[ts_col, close_col], engine="c")
+    if df.empty:
+        raise ValueError(f"No rows loaded from {filename}")
 
-        for row in reader:
-            ts_raw = row.get(ts_col, "")
-            close_raw = row.get(close_col, "")
-            dt = _parse_ts_any(str(ts_raw))
-            px = float(str(close_raw).strip())
-            rows.append((dt, px))
+    close = df[close_col]
+    if not pd.api.types.is_numeric_dtype(close):
+        close = pd.to_numeric(close.astype(str).str.strip())
 
-    if not rows:
-        raise ValueError(f"No rows loaded from {filename}")
+    ts = _ts_column_to_dt64(df[ts_col])
+    px = close.to_numpy(dtype=np.float64)
+    if np.isnat(ts).any() or np.isnan(px).any():
+        raise ValueError(f"Missing timestamp/close values in {filename}")
 
-    rows.sort(key=lambda x: x[0])
-    return rows
+    # exchange dumps are normally already time-ordered: one vectorized check,
+    # sort only if needed
+    if not np.all(ts[1:] >= ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts, px = ts[order], px[order]
+    return ts, px
 
 
 def filter_period(
-    data: List[Tuple[datetime, float]],
+    data: Tuple[np.ndarray, ...],
     start_ts: datetime,
     end_ts: datetime,
-) -> List[Tuple[datetime, float]]:
-    out: List[Tuple[datetime, float]] = []
-    for ts, p in data:
-        if start_ts <= ts <= end_ts:
-            out.append((ts, p))
-    return out
+) -> Tuple[np.ndarray, ...]:
+    """
+    Slice [start_ts, end_ts] (inclusive) out of timestamp-sorted data, as
+    returned by load_eth_1h_csv. Binary search for both ends, no per-row scan.
+
+    data[0] is the datetime64 timestamp array; every array in data (e.g. an
+    extra sqrt-price column) is sliced the same way. Slices are views.
+    """
+    ts = data[0]
+    i0 = int(np.searchsorted(ts, _to_dt64(start_ts), side="left"))
+    i1 = int(np.searchsorted(ts, _to_dt64(end_ts), side="right"))
+    return tuple(arr[i0:i1] for arr in data)
 
 
 # -----------------------------
@@ -112,126 +219,104 @@ def calculate_k(P: float, Pl: float, Pu: float, k0: float) -> float:
     - At Plower: k = 1.0
     - At midpoint: k = k0
     - At Pupper: k = 0.0
-    """
-    if P <= Pl:
-        return 1.0
-    if P >= Pu:
-        return 0.0
 
+    Written branchless: each half-line is extended past its end and clipped
+    (min/max), so outside [Pl, Pu] the clip yields 1.0 / 0.0 without separate
+    range checks. Only the midpoint selects between the two halves.
+    """
     mid = (Pl + Pu) / 2.0
-    if P <= mid:
-        # 1.0 -> k0
-        return 1.0 - (1.0 - k0) * (P - Pl) / (mid - Pl)
-    else:
-        # k0 -> 0.0
-        return k0 - k0 * (P - mid) / (Pu - mid)
+    # 1.0 -> k0
+    left = 1.0 - (1.0 - k0) * (P - Pl) / (mid - Pl)
+    left = min(max(left, min(k0, 1.0)), max(k0, 1.0))
+    # k0 -> 0.0
+    right = k0 - k0 * (P - mid) / (Pu - mid)
+    right = min(max(right, min(k0, 0.0)), max(k0, 0.0))
+    return left if P <= mid else right
 
 
 # -----------------------------
-# Backtest core
+# Simulation kernel (numba)
 # -----------------------------
-def run_backtest(
-    csv_file: Optional[str] = None,
-    start_ts: Optional[datetime] = None,
-    end_ts: Optional[datetime] = None,
-    Pl: Optional[float] = None,
-    Pu: Optional[float] = None,
-    eth_in_pool: Optional[float] = None,
-    hedge_k0: Optional[float] = None,
-    threshold: Optional[float] = None,
-) -> Dict:
-    # ---- load config defaults ----
-    csv_file = csv_file or cfg.CSV_FILE
-    start_ts = start_ts or datetime.fromisoformat(cfg.START_TS)
-    end_ts = end_ts or datetime.fromisoformat(cfg.END_TS)
-
-    if start_ts.tzinfo is None:
-        start_ts = start_ts.replace(tzinfo=timezone.utc)
-    else:
-        start_ts = start_ts.astimezone(timezone.utc)
-
-    if end_ts.tzinfo is None:
-        end_ts = end_ts.replace(tzinfo=timezone.utc)
-    else:
-        end_ts = end_ts.astimezone(timezone.utc)
-
-    Pl = float(Pl if Pl is not None else cfg.PL)
-    Pu = float(Pu if Pu is not None else cfg.PU)
-    eth_in_pool = float(eth_in_pool if eth_in_pool is not None else cfg.ETH_IN_POOL)
-    hedge_k0 = float(hedge_k0 if hedge_k0 is not None else cfg.HEDGE_K0)
-    threshold = float(threshold if threshold is not None else cfg.THRESHOLD)
-
-    # ---- Load + filter data ----
-    data_all = load_eth_1h_csv(csv_file)
-    price_data = filter_period(data_all, start_ts, end_ts)
-    if len(price_data) < 2:
-        raise ValueError(f"Not enough data points in period. got={len(price_data)}")
-
-    # ---- Decide P0 ----
-    if getattr(cfg, "P0_MODE", "fixed") == "from_data":
-        P0 = float(price_data[0][1])
-    else:
-        P0 = float(cfg.P0)
-
-    # ---- ETH-must-fill init: derive initial_usdt and L from ETH amount ----
-    initial_usdt = calc_usdt_for_eth_in_pool(P0, Pl, Pu, eth_in_pool)
-
-    import math
-    sqrtP = math.sqrt(P0)
-    sqrtPu = math.sqrt(Pu)
-    denom = (1.0 / sqrtP) - (1.0 / sqrtPu)
-    if denom <= 0:
-        raise ValueError("Invalid range: need P0 < Pu and positive denom for L")
-    L = eth_in_pool / denom
-    eth0, usdt0 = amounts_from_L(P0, Pl, Pu, L)
-    print("DEBUG amounts@P0:", eth0, usdt0)
+_amounts_from_sqrtP_fast = njit(cache=True)(amounts_from_sqrtP_fast)
+
+
+@njit(cache=True)
+def _run_core(
+    prices: np.ndarray,
+    sqrt_prices: np.ndarray,
+    Pl: float,
+    Pu: float,
+    hedge_k0: float,
+    threshold: float,
+    L: float,
+    P0: float,
+    H0: float,
+):
+    """
+    Anchor/threshold scan over an hourly price array.
 
-    # ---- initial hedge ----
-    initial_short_eth = eth_in_pool * hedge_k0
-    current_H = -initial_short_eth  # short is negative
-    cash = 0.0
-    cash += initial_short_eth * P0
+    Same rules as calculate_k (inlined, slopes hoisted; matches it to 1 ulp)
+    + amounts_from_L (in-range case inlined, otherwise jitted
+    amounts_from_sqrtP_fast; range sqrts hoisted and sqrt(P) read from
+    sqrt_prices), so the whole loop runs unboxed. Rebalance records go into
+    preallocated arrays which are truncated to the event count on return.
 
-    # ---- Backtest state ----
+    Returns:
+        (rebal_idx, anchor_before, move, k, eth_now, H_before, H_target,
+         delta_H, cash, hedge_pnl_mtm, cash_end, H_end, cumulative_abs_delta_h)
+    """
+    n = len(prices)
+    rebal_idx = np.empty(n, dtype=np.int64)
+    anchor_arr = np.empty(n)
+    move_arr = np.empty(n)
+    k_arr = np.empty(n)
+    eth_arr = np.empty(n)
+    H_before_arr = np.empty(n)
+    H_arr = np.empty(n)
+    dH_arr = np.empty(n)
+    cash_arr = np.empty(n)
+    mtm_arr = np.empty(n)
+
+    sqrtPa = np.sqrt(Pl)
+    sqrtPb = np.sqrt(Pu)
+    inv_sqrtPb = 1.0 / sqrtPb
+    mid = (Pl + Pu) / 2.0
+    # k(P) half-line slopes folded once: multiplies per rebalance, no divisions
+    left_slope = (1.0 - hedge_k0) / (mid - Pl)
+    right_slope = hedge_k0 / (Pu - mid)
+    left_lo, left_hi = min(hedge_k0, 1.0), max(hedge_k0, 1.0)
+    right_lo, right_hi = min(hedge_k0, 0.0), max(hedge_k0, 0.0)
+
+    current_H = H0  # short is negative
+    cash = -H0 * P0
     anchor_price = P0
-    rebalance_events: List[Dict] = []
-    rebalance_count = 0
     cumulative_abs_delta_h = 0.0
+    m = 0
 
-    # Hedge bookkeeping (cash + position, mark-to-market at the end)
-
-    # LP value start
-    lp_value_start = lp_value(P0, Pl, Pu, L)
-
-    # ---- Print config ----
-    print("\n=== Backtest Configuration ===")
-    print(f"CSV: {csv_file}")
-    print(f"Period: {start_ts.isoformat()} to {end_ts.isoformat()}")
-    print(f"Total hours: {len(price_data)}")
-    print(f"P0: {P0:.2f}, Range: [{Pl:.2f}, {Pu:.2f}]")
-    print(f"Initial LP value: ${lp_value_start:.2f}")
-    print(f"Initial hedge: {current_H:.4f} ETH")
-    print(f"Liquidity L: {L:.2f}")
-
-    # ---- Iterate over data ----
-    for i in range(1, len(price_data)):
-        ts, P_now = price_data[i]
+    for i in range(1, n):
+        P_now = float(prices[i])  # prices may be float32 (PRICE_DTYPE); math stays float64
 
         # Trigger: |P - anchor| / anchor >= threshold
         move = abs(P_now - anchor_price) / anchor_price
         if move < threshold:
             continue
 
-        # BEFORE state
-        H_before = current_H
-
-        # compute target hedge based on k(P)
-        k = calculate_k(P_now, Pl, Pu, hedge_k0)
+        # k(P), branchless clip form of calculate_k
+        k_left = 1.0 - left_slope * (P_now - Pl)
+        k_left = min(max(k_left, left_lo), left_hi)
+        k_right = hedge_k0 - right_slope * (P_now - mid)
+        k_right = min(max(k_right, right_lo), right_hi)
+        k = k_left if P_now <= mid else k_right
 
         # LP composition at P_now (so hedge is based on current ETH in LP)
-        # ⚠️ 注意：amounts_from_L 返回顺序必须是 (eth, usdt)。如果你 v3_math 里相反，这里要对调。
-        eth_now, usdt_now = amounts_from_L(P_now, Pl, Pu, L)
+        sqrtP = float(sqrt_prices[i])
+        if Pl < P_now < Pu:
+            # in range (the common case): only x of the in-range amounts
+            eth_now = L * (1.0 / sqrtP - inv_sqrtPb)
+        else:
+            eth_now, usdt_now = _amounts_from_sqrtP_fast(sqrtP, sqrtPa, inv_sqrtPb, sqrtPb, L)
 
+        H_before = current_H
         target_H = -(eth_now * k)
         delta_h = target_H - H_before
         cumulative_abs_delta_h += abs(delta_h)
@@ -241,38 +326,182 @@ def run_backtest(
         cash -= delta_h * P_now
         current_H = target_H
 
-        # Mark-to-market hedge pnl at this moment
-        hedge_pnl_mtm = cash + current_H * P_now
-
-        rebalance_count += 1
-        rebalance_events.append({
-            "ts": ts.isoformat(),
-            "price": P_now,
-            "anchor_before": anchor_price,
-            "move": move,
-            "k": k,
-            "eth_now": eth_now,
-            "H_before": H_before,
-            "H_target": target_H,
-            "delta_H": delta_h,
-            "cash": cash,
-            "hedge_pnl_mtm": hedge_pnl_mtm,
-        })
+        rebal_idx[m] = i
+        anchor_arr[m] = anchor_price
+        move_arr[m] = move
+        k_arr[m] = k
+        eth_arr[m] = eth_now
+        H_before_arr[m] = H_before
+        H_arr[m] = target_H
+        dH_arr[m] = delta_h
+        cash_arr[m] = cash
+        mtm_arr[m] = cash + current_H * P_now  # mark-to-market hedge pnl
+        m += 1
 
         # update anchor only after rebalance
         anchor_price = P_now
 
-    final_price = float(price_data[-1][1])
+    return (
+        rebal_idx[:m], anchor_arr[:m], move_arr[:m], k_arr[:m], eth_arr[:m],
+        H_before_arr[:m], H_arr[:m], dH_arr[:m], cash_arr[:m], mtm_arr[:m],
+        cash, current_H, cumulative_abs_delta_h,
+    )
+
+
+@njit(parallel=True, cache=True)
+def _sweep_core(
+    prices: np.ndarray,
+    sqrt_prices: np.ndarray,
+    Pl: float,
+    Pu: float,
+    L: float,
+    P0: float,
+    eth_in_pool: float,
+    thresholds: np.ndarray,
+    hedge_k0s: np.ndarray,
+):
+    """
+    _run_core for every (threshold, hedge_k0) cell, cells spread over cores
+    with prange. Cell c is (thresholds[c // len(hedge_k0s)], hedge_k0s[c % len(hedge_k0s)]).
+
+    Returns per-cell (rebalance_count, cash_end, H_end, cumulative_abs_delta_h).
+    """
+    nk = len(hedge_k0s)
+    n_cells = len(thresholds) * nk
+    count = np.empty(n_cells, dtype=np.int64)
+    cash_end = np.empty(n_cells)
+    H_end = np.empty(n_cells)
+    cum_dh = np.empty(n_cells)
+
+    for c in prange(n_cells):
+        th = thresholds[c // nk]
+        k0 = hedge_k0s[c % nk]
+        res = _run_core(prices, sqrt_prices, Pl, Pu, k0, th, L, P0, -(eth_in_pool * k0))
+        count[c] = len(res[0])
+        cash_end[c] = res[10]
+        H_end[c] = res[11]
+        cum_dh[c] = res[12]
+
+    return count, cash_end, H_end, cum_dh
+
+
+# -----------------------------
+# Price cache
+# -----------------------------
+# Full parsed series per CSV, keyed by (csv_file, price dtype). Each entry is
+# (mtime, (timestamps, prices, sqrt_prices)); a changed mtime replaces the
+# entry, so edits to the CSV don't pile up stale series in a long-running
+# process (e.g. the Streamlit server). np.sqrt is taken once here so the
+# kernel reads it instead of taking a sqrt per rebalance. Periods are cut out
+# with filter_period as zero-copy views, so sweeps and re-runs over any window
+# of the same file only pay for the CSV parse once.
+#
+# cfg.PRICE_DTYPE (default "float64") sets the stored dtype of prices and
+# sqrt_prices. "float32" halves the series' memory/bandwidth for long (e.g.
+# 1m) data; the kernel still does all math and accumulation in float64. On
+# eth_1h.csv it moves total PnL by < 1e-6 relative with identical rebalance
+# points, but it is not bit-reproducible with float64 results.
+_DATA_CACHE: Dict[Tuple[str, str], Tuple[float, Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+
+
+def _resolve_period(
+    csv_file: Optional[str],
+    start_ts: Optional[datetime],
+    end_ts: Optional[datetime],
+) -> Tuple[str, datetime, datetime]:
+    csv_file = csv_file or cfg.CSV_FILE
+    start_ts = start_ts or datetime.fromisoformat(cfg.START_TS)
+    end_ts = end_ts or datetime.fromisoformat(cfg.END_TS)
+    return csv_file, _to_utc(start_ts), _to_utc(end_ts)
+
+
+def _load_prices(
+    csv_file: str,
+    start_ts: datetime,
+    end_ts: datetime,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load the CSV once per file (cached in _DATA_CACHE) and slice the period.
+
+    Returns (timestamps, prices, sqrt_prices) as datetime64[ns] views and
+    PRICE_DTYPE views. All are read-only since they are shared between callers.
+    """
+    price_dtype = np.dtype(getattr(cfg, "PRICE_DTYPE", "float64"))
+    key = (csv_file, price_dtype.name)
+    mtime = os.path.getmtime(csv_file)
+    cached = _DATA_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        data = cached[1]
+    else:
+        timestamps, prices = load_eth_1h_csv(csv_file)
+        prices = prices.astype(price_dtype, copy=False)
+        data = (timestamps, prices, np.sqrt(prices))
+        for arr in data:
+            arr.flags.writeable = False
+        _DATA_CACHE[key] = (mtime, data)
+
+    timestamps, prices, sqrt_prices = filter_period(data, start_ts, end_ts)
+    if len(prices) < 2:
+        raise ValueError(f"Not enough data points in period. got={len(prices)}")
+    return timestamps, prices, sqrt_prices
+
+
+# -----------------------------
+# Backtest core
+# -----------------------------
+def _init_lp(prices: np.ndarray, Pl: float, Pu: float, eth_in_pool: float) -> Dict:
+    """P0, L, initial USDT and LP start/end values (independent of hedge params)."""
+    # ---- Decide P0 ----
+    if getattr(cfg, "P0_MODE", "fixed") == "from_data":
+        P0 = float(prices[0])
+    else:
+        P0 = float(cfg.P0)
+
+    # ---- ETH-must-fill init: derive initial_usdt and L from ETH amount ----
+    initial_usdt = calc_usdt_for_eth_in_pool(P0, Pl, Pu, eth_in_pool)
+
+    sqrtP = math.sqrt(P0)
+    sqrtPu = math.sqrt(Pu)
+    denom = (1.0 / sqrtP) - (1.0 / sqrtPu)
+    if denom <= 0:
+        raise ValueError("Invalid range: need P0 < Pu and positive denom for L")
+    L = eth_in_pool / denom
+
+    final_price = float(prices[-1])
 
+    return {
+        "P0": P0,
+        "L": L,
+        "initial_usdt_required": initial_usdt,
+        "final_price": final_price,
+        "lp_value_start": lp_value(P0, Pl, Pu, L),
+        "lp_value_end": lp_value(final_price, Pl, Pu, L),
+    }
+
+
+def _summarize(
+    Pl: float,
+    Pu: float,
+    eth_in_pool: float,
+    hedge_k0: float,
+    threshold: float,
+    init: Dict,
+    rebalance_count: int,
+    cumulative_abs_delta_h: float,
+    cash: float,
+    current_H: float,
+) -> Dict:
+    final_price = init["final_price"]
 
     # Final mark-to-market for hedge
     hedge_pnl = cash + current_H * final_price
 
-    lp_value_end = lp_value(final_price, Pl, Pu, L)
+    lp_value_start = init["lp_value_start"]
+    lp_value_end = init["lp_value_end"]
     lp_pnl = lp_value_end - lp_value_start
     total_pnl = lp_pnl + hedge_pnl
 
-    summary = {
+    return {
         "rebalance_count": rebalance_count,
         "cumulative_abs_delta_h": cumulative_abs_delta_h,
         "hedge_pnl": hedge_pnl,
@@ -282,31 +511,187 @@ def run_backtest(
         "lp_value_start": lp_value_start,
         "lp_value_end": lp_value_end,
         "final_hedge_position": current_H,
-        "P0": P0,
+        "P0": init["P0"],
         "Pl": Pl,
         "Pu": Pu,
-        "L": L,
+        "L": init["L"],
         "eth_in_pool": eth_in_pool,
-        "initial_usdt_required": initial_usdt,
+        "initial_usdt_required": init["initial_usdt_required"],
         "threshold": threshold,
         "hedge_k0": hedge_k0,
     }
 
+
+def _simulate(
+    prices: np.ndarray,
+    sqrt_prices: np.ndarray,
+    Pl: float,
+    Pu: float,
+    eth_in_pool: float,
+    hedge_k0: float,
+    threshold: float,
+) -> Dict:
+    """
+    Run the strategy on an already loaded price array (+ its np.sqrt).
+
+    Returns {"summary": ..., "events": ...} where events holds the per-rebalance
+    arrays from _run_core (rebal_idx indexes into prices).
+    """
+    init = _init_lp(prices, Pl, Pu, eth_in_pool)
+
+    # ---- initial hedge ----
+    initial_short_eth = eth_in_pool * hedge_k0
+    initial_H = -initial_short_eth  # short is negative
+
+    # ---- Run simulation kernel ----
+    # Hedge bookkeeping (cash + position, mark-to-market at the end)
+    (
+        rebal_idx, anchor_before, move, k, eth_now, H_before, H_target,
+        delta_H, cash_after, hedge_pnl_mtm, cash, current_H, cumulative_abs_delta_h,
+    ) = _run_core(prices, sqrt_prices, Pl, Pu, hedge_k0, threshold, init["L"], init["P0"], initial_H)
+
+    summary = _summarize(
+        Pl, Pu, eth_in_pool, hedge_k0, threshold, init,
+        len(rebal_idx), cumulative_abs_delta_h, cash, current_H,
+    )
+
+    events = {
+        "rebal_idx": rebal_idx,
+        "price": prices[rebal_idx],
+        "anchor_before": anchor_before,
+        "move": move,
+        "k": k,
+        "eth_now": eth_now,
+        "H_before": H_before,
+        "H_target": H_target,
+        "delta_H": delta_H,
+        "cash": cash_after,
+        "hedge_pnl_mtm": hedge_pnl_mtm,
+    }
+
+    return {
+        "summary": summary,
+        "events": events,
+    }
+
+
+def run_backtest(
+    csv_file: Optional[str] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+    Pl: Optional[float] = None,
+    Pu: Optional[float] = None,
+    eth_in_pool: Optional[float] = None,
+    hedge_k0: Optional[float] = None,
+    threshold: Optional[float] = None,
+    verbose: bool = True,
+) -> Dict:
+    # ---- load config defaults ----
+    csv_file, start_ts, end_ts = _resolve_period(csv_file, start_ts, end_ts)
+
+    Pl = float(Pl if Pl is not None else cfg.PL)
+    Pu = float(Pu if Pu is not None else cfg.PU)
+    eth_in_pool = float(eth_in_pool if eth_in_pool is not None else cfg.ETH_IN_POOL)
+    hedge_k0 = float(hedge_k0 if hedge_k0 is not None else cfg.HEDGE_K0)
+    threshold = float(threshold if threshold is not None else cfg.THRESHOLD)
+
+    # ---- Load + filter data (cached) ----
+    timestamps, prices, sqrt_prices = _load_prices(csv_file, start_ts, end_ts)
+
+    res = _simulate(prices, sqrt_prices, Pl, Pu, eth_in_pool, hedge_k0, threshold)
+    summary = res["summary"]
+    ev = res["events"]
+
+    if verbose:
+        P0 = summary["P0"]
+        L = summary["L"]
+        eth0, usdt0 = amounts_from_L(P0, Pl, Pu, L)
+        print("DEBUG amounts@P0:", eth0, usdt0)
+
+        # ---- Print config ----
+        print("\n=== Backtest Configuration ===")
+        print(f"CSV: {csv_file}")
+        print(f"Period: {start_ts.isoformat()} to {end_ts.isoformat()}")
+        print(f"Total hours: {len(prices)}")
+        print(f"P0: {P0:.2f}, Range: [{Pl:.2f}, {Pu:.2f}]")
+        print(f"Initial LP value: ${summary['lp_value_start']:.2f}")
+        print(f"Initial hedge: {-(eth_in_pool * hedge_k0):.4f} ETH")
+        print(f"Liquidity L: {L:.2f}")
+
+    # Events stay as parallel arrays until here; one DataFrame at the boundary.
+    ts = pd.DatetimeIndex(timestamps[ev["rebal_idx"]]).tz_localize("UTC")
+    rebalance_events = pd.DataFrame({
+        "ts": [t.isoformat() for t in ts],
+        "price": ev["price"],
+        "anchor_before": ev["anchor_before"],
+        "move": ev["move"],
+        "k": ev["k"],
+        "eth_now": ev["eth_now"],
+        "H_before": ev["H_before"],
+        "H_target": ev["H_target"],
+        "delta_H": ev["delta_H"],
+        "cash": ev["cash"],
+        "hedge_pnl_mtm": ev["hedge_pnl_mtm"],
+    })
+
     return {
         "rebalance_events": rebalance_events,
         "summary": summary,
     }
 
 
-def write_rebalance_events_csv(events: List[Dict], filename: str = "rebalance_events.csv"):
-    if not events:
+def run_sweep(
+    thresholds: List[float],
+    hedge_k0s: List[float],
+    csv_file: Optional[str] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+    Pl: Optional[float] = None,
+    Pu: Optional[float] = None,
+    eth_in_pool: Optional[float] = None,
+) -> Dict[Tuple[float, float], Dict]:
+    """
+    Batch entry point for parameter sweeps.
+
+    Loads the price series once and runs the kernel for every
+    (threshold, hedge_k0) cell, in parallel across CPU cores (numba prange
+    over the cell grid). No printing, no per-event output.
+
+    Returns {(threshold, hedge_k0): summary}.
+    """
+    csv_file, start_ts, end_ts = _resolve_period(csv_file, start_ts, end_ts)
+
+    Pl = float(Pl if Pl is not None else cfg.PL)
+    Pu = float(Pu if Pu is not None else cfg.PU)
+    eth_in_pool = float(eth_in_pool if eth_in_pool is not None else cfg.ETH_IN_POOL)
+
+    _, prices, sqrt_prices = _load_prices(csv_file, start_ts, end_ts)
+
+    init = _init_lp(prices, Pl, Pu, eth_in_pool)
+    count, cash_end, H_end, cum_dh = _sweep_core(
+        prices, sqrt_prices, Pl, Pu, init["L"], init["P0"], eth_in_pool,
+        np.asarray(thresholds, dtype=np.float64),
+        np.asarray(hedge_k0s, dtype=np.float64),
+    )
+
+    out: Dict[Tuple[float, float], Dict] = {}
+    c = 0
+    for th in thresholds:
+        for k0 in hedge_k0s:
+            out[(th, k0)] = _summarize(
+                Pl, Pu, eth_in_pool, float(k0), float(th), init,
+                int(count[c]), float(cum_dh[c]), float(cash_end[c]), float(H_end[c]),
+            )
+            c += 1
+    return out
+
+
+def write_rebalance_events_csv(events: pd.DataFrame, filename: str = "rebalance_events.csv"):
+    if events.empty:
         print("No rebalance events to write")
         return
-    fieldnames = list(events[0].keys())
-    with open(filename, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(events)
+    # pandas C writer; repr floats + \r\n rows, byte-identical to the old csv.DictWriter output
+    events.to_csv(filename, index=False, lineterminator="\r\n")
     print(f"\nWrote {len(events)} events -> {filename}")
 
 
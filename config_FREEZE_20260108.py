@@ -9,6 +9,7 @@ CSV_FILE = "eth_1h.csv"
 START_TS = "2025-11-07T00:00:00+00:00"
 END_TS   = "2026-01-06T00:00:00+00:00"
 P0_MODE = "from_data"   # "from_data" or "fixed"
+PRICE_DTYPE = "float64"  # "float64" or "float32" (price series storage only; float64 = validated)
 
 # ===== LP init (ETH must fill) =====
 # NOTE:
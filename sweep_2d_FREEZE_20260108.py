@@ -1,20 +1,7 @@
 # sweep_2d.py
-import io
-import contextlib
-
 import backtest_eth as bt
 
 
-def run_once(threshold: float, hedge_k0: float) -> dict:
-    """
-    Run one backtest with given params, without touching global config.
-    """
-    buf = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        res = bt.run_backtest(threshold=threshold, hedge_k0=hedge_k0)
-    return res
-
-
 def main():
     thresholds = [0.03, 0.05, 0.07, 0.10, 0.15]
     hedge_k0s = [0.30, 0.50, 0.70, 0.90]
@@ -26,13 +13,15 @@ def main():
     print()
     print("-" * (8 + 12 * len(hedge_k0s)))
 
+    # all cells run in parallel; printing below just reads the results
+    summaries = bt.run_sweep(thresholds, hedge_k0s)
+
     detailed = []
 
     for th in thresholds:
         print(f"{th:>8.2f}", end="")
         for k0 in hedge_k0s:
-            res = run_once(th, k0)
-            s = res["summary"]
+            s = summaries[(th, k0)]
 
             total = float(s["total_pnl"])
             hedge = float(s["hedge_pnl"])
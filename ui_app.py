@@ -1,5 +1,6 @@
+import os
+
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timezone
 
 import backtest_eth_FREEZE_20260108 as bt
@@ -35,6 +36,32 @@ def parse_iso_utc(s: str) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def run_backtest_cached(
+    csv_file: str,
+    csv_mtime: float | None,
+    start_ts: datetime,
+    end_ts: datetime,
+    Pl: float,
+    Pu: float,
+    eth_in_pool: float,
+    hedge_k0: float,
+    threshold: float,
+) -> dict:
+    # 按全部参数缓存；csv_mtime 只用于 key，CSV 改动后自动重算
+    return bt.run_backtest(
+        csv_file=csv_file,
+        start_ts=start_ts,
+        end_ts=end_ts,
+        Pl=Pl,
+        Pu=Pu,
+        eth_in_pool=eth_in_pool,
+        hedge_k0=hedge_k0,
+        threshold=threshold,
+        verbose=False,
+    )
+
+
 # -------- Run + persist result --------
 if run_btn:
     try:
@@ -45,15 +72,10 @@ if run_btn:
         st.stop()
 
     with st.spinner("回测运行中..."):
-        result = bt.run_backtest(
-            csv_file=csv_file,
-            start_ts=start_ts,
-            end_ts=end_ts,
-            Pl=Pl,
-            Pu=Pu,
-            eth_in_pool=eth_in_pool,
-            hedge_k0=hedge_k0,
-            threshold=threshold,
+        csv_mtime = os.path.getmtime(csv_file) if os.path.exists(csv_file) else None
+        result = run_backtest_cached(
+            csv_file, csv_mtime, start_ts, end_ts,
+            Pl, Pu, eth_in_pool, hedge_k0, threshold,
         )
     st.session_state["last_result"] = result
     st.success("回测完成 ✅")
@@ -94,9 +116,8 @@ with st.expander("配置回显（本次 run_backtest 实际使用）", expanded=
     })
 
 st.subheader("Rebalance 事件")
-if events:
-    df = pd.DataFrame(events)
-    st.dataframe(df, use_container_width=True, height=420)
+if not events.empty:
+    st.dataframe(events, use_container_width=True, height=420)
 else:
     st.warning("没有触发 rebalance（events 为空）")
 
@@ -5,6 +5,7 @@ No fees, no external dependencies.
 """
 
 import math
+from dataclasses import dataclass, field
 from typing import Tuple
 
 
@@ -28,18 +29,52 @@ def amounts_from_L(P: float, Pl: float, Pu: float, L: float) -> Tuple[float, flo
     if Pl >= Pu:
         raise ValueError("Pl must be < Pu")
     
-    sqrtP = math.sqrt(P)
-    sqrtPa = math.sqrt(Pl)
     sqrtPb = math.sqrt(Pu)
+    return amounts_from_L_fast(P, math.sqrt(Pl), 1/sqrtPb, sqrtPb, L)
+
+
+def amounts_from_L_fast(P: float, sqrtPa: float, sqrtPb_inv: float, sqrtPb: float,
+                        L: float) -> Tuple[float, float]:
+    """
+    amounts_from_L with the range square roots precomputed by the caller.
+    
+    No input validation; for hot loops where Pl, Pu, L are fixed and were
+    checked once up front. Only sqrt(P) is computed per call.
+    
+    Args:
+        P: Current price (quote per base)
+        sqrtPa: sqrt(Pl)
+        sqrtPb_inv: 1/sqrt(Pu)
+        sqrtPb: sqrt(Pu)
+        L: Virtual liquidity
+        
+    Returns:
+        (x, y): Base token amount, quote token amount
+    """
+    return amounts_from_sqrtP_fast(math.sqrt(P), sqrtPa, sqrtPb_inv, sqrtPb, L)
+
+
+def amounts_from_sqrtP_fast(sqrtP: float, sqrtPa: float, sqrtPb_inv: float, sqrtPb: float,
+                            L: float) -> Tuple[float, float]:
+    """
+    amounts_from_L_fast taking sqrt(P) directly (e.g. from a precomputed
+    sqrt price series), so no transcendental is evaluated at all. Plain
+    arithmetic only, so it can also be wrapped with numba.njit.
+    
+    Returns:
+        (x, y): Base token amount, quote token amount
+    """
+    # sqrt is monotonic, so comparing in sqrt space picks the same case
+    # (ties at the boundary give identical amounts either way).
     
     # Case 1: Below range - all base token
-    if P <= Pl:
-        x = L * (1/sqrtPa - 1/sqrtPb)
+    if sqrtP <= sqrtPa:
+        x = L * (1/sqrtPa - sqrtPb_inv)
         y = 0.0
     
     # Case 2: In range - both tokens
-    elif P < Pu:
-        x = L * (1/sqrtP - 1/sqrtPb)
+    elif sqrtP < sqrtPb:
+        x = L * (1/sqrtP - sqrtPb_inv)
         y = L * (sqrtP - sqrtPa)
     
     # Case 3: Above range - all quote token
@@ -63,8 +98,45 @@ def lp_value(P: float, Pl: float, Pu: float, L: float) -> float:
     Returns:
         Total value in quote token units
     """
-    x, y = amounts_from_L(P, Pl, Pu, L)
-    return x * P + y
+    if P <= 0 or Pl <= 0 or Pu <= 0:
+        raise ValueError("All prices must be positive")
+    if L <= 0:
+        raise ValueError("Liquidity must be positive")
+    if Pl >= Pu:
+        raise ValueError("Pl must be < Pu")
+    
+    sqrtPb = math.sqrt(Pu)
+    return lp_value_fast(P, math.sqrt(Pl), 1/sqrtPb, sqrtPb, L)
+
+
+def lp_value_fast(P: float, sqrtPa: float, sqrtPb_inv: float, sqrtPb: float,
+                  L: float) -> float:
+    """
+    lp_value with the range square roots precomputed, x*P + y fused into one
+    closed form per case (no amounts tuple). No input validation.
+    
+    Args:
+        P: Current price (quote per base)
+        sqrtPa: sqrt(Pl)
+        sqrtPb_inv: 1/sqrt(Pu)
+        sqrtPb: sqrt(Pu)
+        L: Virtual liquidity
+        
+    Returns:
+        Total value in quote token units
+    """
+    sqrtP = math.sqrt(P)
+    
+    # Below range: x * P
+    if sqrtP <= sqrtPa:
+        return L * (1/sqrtPa - sqrtPb_inv) * P
+    
+    # In range: L*(1/sqrtP - 1/sqrtPb)*P + L*(sqrtP - sqrtPa)
+    if sqrtP < sqrtPb:
+        return L * (2*sqrtP - sqrtPa - P*sqrtPb_inv)
+    
+    # Above range: y
+    return L * (sqrtPb - sqrtPa)
 
 
 def L_from_initial_usd(P0: float, Pl: float, Pu: float, initial_usd: float) -> float:
@@ -102,28 +174,37 @@ def L_from_initial_usd(P0: float, Pl: float, Pu: float, initial_usd: float) -> f
     return L
 
 
+@dataclass(slots=True, frozen=True)
 class LPPosition:
     """
     Represents a Uniswap V3 concentrated liquidity position.
     
+    Immutable, __slots__-based: no per-instance __dict__, so many positions
+    (e.g. Monte Carlo) stay small and attribute access is fast.
+    
     Attributes:
         L: Virtual liquidity (invariant)
         Plower: Lower tick price
         Pupper: Upper tick price
+        sqrtPa, sqrtPb, sqrtPb_inv: sqrt(Plower), sqrt(Pupper), 1/sqrt(Pupper),
+            derived in __post_init__
     """
     
-    def __init__(self, L: float, Plower: float, Pupper: float):
+    L: float
+    Plower: float
+    Pupper: float
+    sqrtPa: float = field(init=False, repr=False)
+    sqrtPb: float = field(init=False, repr=False)
+    sqrtPb_inv: float = field(init=False, repr=False)
+    
+    def __post_init__(self):
         """
-        Initialize LP position with liquidity and price range.
+        Validate liquidity and price range, derive the sqrt prices.
         
-        Args:
-            L: Virtual liquidity (must be positive)
-            Plower: Lower bound price (must be positive)
-            Pupper: Upper bound price (must be > Plower)
-            
         Raises:
             ValueError: If inputs violate constraints
         """
+        L, Plower, Pupper = self.L, self.Plower, self.Pupper
         if L <= 0:
             raise ValueError(f"Liquidity must be positive, got {L}")
         if Plower <= 0 or Pupper <= 0:
@@ -131,19 +212,22 @@ class LPPosition:
         if Plower >= Pupper:
             raise ValueError(f"Plower must be < Pupper, got {Plower} >= {Pupper}")
         
-        self.L = L
-        self.Plower = Plower
-        self.Pupper = Pupper
-        self.sqrtPa = math.sqrt(Plower)
-        self.sqrtPb = math.sqrt(Pupper)
+        sqrtPb = math.sqrt(Pupper)
+        object.__setattr__(self, "sqrtPa", math.sqrt(Plower))
+        object.__setattr__(self, "sqrtPb", sqrtPb)
+        object.__setattr__(self, "sqrtPb_inv", 1/sqrtPb)
     
     def get_amounts(self, P: float) -> Tuple[float, float]:
         """Calculate token amounts (x, y) at price P."""
-        return amounts_from_L(P, self.Plower, self.Pupper, self.L)
+        if P <= 0:
+            raise ValueError("All prices must be positive")
+        return amounts_from_L_fast(P, self.sqrtPa, self.sqrtPb_inv, self.sqrtPb, self.L)
     
     def get_value(self, P: float) -> float:
         """Calculate total position value at price P."""
-        return lp_value(P, self.Plower, self.Pupper, self.L)
+        if P <= 0:
+            raise ValueError("All prices must be positive")
+        return lp_value_fast(P, self.sqrtPa, self.sqrtPb_inv, self.sqrtPb, self.L)
     
     @classmethod
     def from_initial_value(cls, P0: float, Plower: float, Pupper: float, 
@@ -186,4 +270,39 @@ if __name__ == "__main__":
     except ValueError:
         pass
     
+    # Test 6: Fast variants match the validated functions below/in/above range
+    sqrtPa, sqrtPb = math.sqrt(Pl), math.sqrt(Pu)
+    sqrtPb_inv = 1/sqrtPb
+    for P in (1700.0, Pl, 1900.0, P0, 2100.0, Pu, 2300.0):
+        x, y = amounts_from_L(P, Pl, Pu, L)
+        assert amounts_from_L_fast(P, sqrtPa, sqrtPb_inv, sqrtPb, L) == (x, y), f"amounts_from_L_fast mismatch at P={P}"
+        assert amounts_from_sqrtP_fast(math.sqrt(P), sqrtPa, sqrtPb_inv, sqrtPb, L) == (x, y), f"amounts_from_sqrtP_fast mismatch at P={P}"
+        v = lp_value(P, Pl, Pu, L)
+        assert lp_value_fast(P, sqrtPa, sqrtPb_inv, sqrtPb, L) == v, f"lp_value_fast mismatch at P={P}"
+        # fused closed form vs x*P + y
+        assert abs(v - (x*P + y)) < 1e-9 * initial_usd, f"lp_value != x*P + y at P={P}: {v} vs {x*P + y}"
+    
+    # Test 7: LPPosition agrees with the free functions
+    pos = LPPosition.from_initial_value(P0, Pl, Pu, initial_usd)
+    assert pos.L == L, f"from_initial_value L mismatch: {pos.L} vs {L}"
+    for P in (1700.0, P0, 2300.0):
+        assert pos.get_amounts(P) == amounts_from_L(P, Pl, Pu, L), f"get_amounts mismatch at P={P}"
+        assert pos.get_value(P) == lp_value(P, Pl, Pu, L), f"get_value mismatch at P={P}"
+    
+    # Test 8: LPPosition is immutable
+    from dataclasses import FrozenInstanceError
+    try:
+        pos.L = 1.0
+        assert False, "Should reject field assignment"
+    except FrozenInstanceError:
+        pass
+    
+    # Test 9: LPPosition validates its inputs
+    for args in ((0.0, Pl, Pu), (L, -1.0, Pu), (L, Pu, Pl)):
+        try:
+            LPPosition(*args)
+            assert False, f"Should reject LPPosition{args}"
+        except ValueError:
+            pass
+    
     print("All tests passed")